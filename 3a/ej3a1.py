@@ -15,11 +15,63 @@ Este ejercicio se enfoca en las operaciones básicas de SQL desde Python sin uti
 
 import os
 import sqlite3
+import sys
+from contextlib import contextmanager
 
 # Ruta de la base de datos (en memoria para este ejemplo)
 # Para una base de datos en archivo, usar: 'biblioteca.db'
 DB_PATH = ":memory:"
 
+# Ajustes de rendimiento aplicados a cada conexión nueva
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Tamaño de la caché de sentencias preparadas de cada conexión
+CACHED_STATEMENTS = 256
+
+# Consultas fijas: usar siempre el mismo texto SQL permite reutilizar la
+# sentencia ya compilada en la caché de la conexión
+_SQL_CONSULTAR_LIBROS = """
+    SELECT l.titulo, l.anio, a.nombre
+    FROM libros l
+    JOIN autores a ON l.autor_id = a.id
+    ORDER BY l.titulo
+"""
+
+_SQL_LIBROS_POR_AUTOR = """
+    SELECT l.titulo, l.anio
+    FROM libros l
+    JOIN autores a ON l.autor_id = a.id
+    WHERE a.nombre = ?
+"""
+
+# Límite de parámetros por sentencia en SQLite (el valor por defecto más bajo,
+# el de las versiones anteriores a 3.32)
+MAX_PARAMETROS = 999
+
+# Una única sentencia UPDATE para cualquier combinación de campos: si un
+# parámetro es NULL, COALESCE conserva el valor actual de la columna
+_UPDATE_LIBRO = """
+    UPDATE libros
+    SET titulo = COALESCE(?, titulo), anio = COALESCE(?, anio)
+    WHERE id = ?
+"""
+
+
+def _aplicar_pragmas(conexion):
+    """
+    Configura la conexión: modo WAL (solo para bases de datos en archivo)
+    y el resto de PRAGMAs de PRAGMAS
+    """
+    if DB_PATH != ":memory:":
+        conexion.execute("PRAGMA journal_mode=WAL")
+    for pragma in PRAGMAS:
+        conexion.execute(pragma)
+
 
 def crear_conexion():
     """
@@ -27,13 +79,65 @@ def crear_conexion():
     """
     # Implementa la creación de la conexión y retorna el objeto conexión
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+        _aplicar_pragmas(conn)
         return conn
     except sqlite3.Error as e:
         print(f"Error al crear la conexión: {e}")
         return None
 
 
+@contextmanager
+def transaccion(conexion):
+    """
+    Agrupa varias operaciones de escritura en una única transacción explícita.
+    Confirma al salir sin errores y revierte si se produce una excepción,
+    de modo que todo el bloque paga un solo commit en lugar de uno por operación.
+    """
+    conexion.execute("BEGIN IMMEDIATE")
+    try:
+        yield conexion
+    except BaseException:
+        conexion.rollback()
+        raise
+    else:
+        conexion.commit()
+
+
+@contextmanager
+def sin_claves_foraneas(conexion):
+    """
+    Desactiva la comprobación de claves foráneas durante una carga masiva de
+    datos de confianza (cada INSERT en libros se ahorra la búsqueda del autor)
+    y al salir restaura el valor que tenía. PRAGMA foreign_keys no tiene efecto
+    dentro de una transacción, así que debe envolver a transaccion(), no al revés
+    """
+    activadas = conexion.execute("PRAGMA foreign_keys").fetchone()[0]
+    conexion.execute("PRAGMA foreign_keys=OFF")
+    try:
+        yield conexion
+    finally:
+        conexion.execute(f"PRAGMA foreign_keys={'ON' if activadas else 'OFF'}")
+
+
+def _insertar_en_bloque(conexion, tabla, columnas, filas, bloque=500):
+    """
+    Inserta las filas con sentencias INSERT de varias filas
+    (VALUES (?, ?), (?, ?), ...), de modo que cada bloque es una sola ejecución
+    de la sentencia en lugar de una por fila. El tamaño del bloque se ajusta
+    para no superar MAX_PARAMETROS
+    """
+    bloque = max(1, min(bloque, MAX_PARAMETROS // len(columnas)))
+    marcador = "(" + ", ".join("?" * len(columnas)) + ")"
+    cabecera = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES "
+    for inicio in range(0, len(filas), bloque):
+        lote = filas[inicio : inicio + bloque]
+        conexion.execute(
+            cabecera + ", ".join([marcador] * len(lote)),
+            [valor for fila in lote for valor in fila],
+        )
+
+
 def crear_tablas(conexion):
     """
     Crea las tablas necesarias para la biblioteca:
@@ -46,10 +150,15 @@ def crear_tablas(conexion):
     try:
         cursor = conexion.cursor()
 
+        # Las claves son INTEGER PRIMARY KEY sin AUTOINCREMENT: SQLite asigna
+        # igualmente ids crecientes (rowid) sin mantener la tabla
+        # sqlite_sequence en cada inserción. A cambio, el id del último libro o
+        # autor eliminado puede reutilizarse, lo que aquí no es un problema
+
         # Crear tabla autores
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS autores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 nombre TEXT NOT NULL
             )
         """)
@@ -57,7 +166,7 @@ def crear_tablas(conexion):
         # Crear tabla libros
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS libros (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 titulo TEXT NOT NULL,
                 anio INTEGER,
                 autor_id INTEGER,
@@ -65,6 +174,12 @@ def crear_tablas(conexion):
             )
         """)
 
+        # Índice sobre la clave foránea: SQLite no lo crea automáticamente y
+        # sin él cada JOIN con autores recorre la tabla libros completa
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_libros_autor ON libros (autor_id)"
+        )
+
         conexion.commit()
 
     except sqlite3.Error as e:
@@ -72,41 +187,45 @@ def crear_tablas(conexion):
         conexion.rollback()
 
 
-def insertar_autores(conexion, autores):
+def insertar_autores(conexion, autores, commit=True):
     """
     Inserta varios autores en la tabla 'autores'
     Parámetro autores: Lista de tuplas (nombre,)
+    Parámetro commit: False si la transacción la gestiona quien llama
     """
     # Implementa la inserción de autores usando SQL INSERT
     # Usa consultas parametrizadas para mayor seguridad
     try:
-        cursor = conexion.cursor()
-        cursor.executemany("INSERT INTO autores (nombre) VALUES (?)", autores)
-        conexion.commit()
+        _insertar_en_bloque(conexion, "autores", ("nombre",), autores)
+        if commit:
+            conexion.commit()
         print(f"Se insertaron {len(autores)} autores correctamente.")
 
     except sqlite3.Error as e:
         print(f"Error al insertar autores: {e}")
+        if not commit:
+            raise
         conexion.rollback()
 
 
-def insertar_libros(conexion, libros):
+def insertar_libros(conexion, libros, commit=True):
     """
     Inserta varios libros en la tabla 'libros'
     Parámetro libros: Lista de tuplas (titulo, anio, autor_id)
+    Parámetro commit: False si la transacción la gestiona quien llama
     """
     # Implementa la inserción de libros usando SQL INSERT
     # Usa consultas parametrizadas para mayor seguridad
     try:
-        cursor = conexion.cursor()
-        cursor.executemany(
-            "INSERT INTO libros (titulo, anio, autor_id) VALUES (?, ?, ?)", libros
-        )
-        conexion.commit()
+        _insertar_en_bloque(conexion, "libros", ("titulo", "anio", "autor_id"), libros)
+        if commit:
+            conexion.commit()
         print(f"Se insertaron {len(libros)} libros correctamente.")
 
     except sqlite3.Error as e:
         print(f"Error al insertar libros: {e}")
+        if not commit:
+            raise
         conexion.rollback()
 
 
@@ -118,18 +237,17 @@ def consultar_libros(conexion):
     # Imprime los resultados formateados
     try:
         cursor = conexion.cursor()
-        cursor.execute("""
-            SELECT l.titulo, l.anio, a.nombre
-            FROM libros l
-            JOIN autores a ON l.autor_id = a.id
-            ORDER BY l.titulo
-        """)
+        cursor.execute(_SQL_CONSULTAR_LIBROS)
 
         libros = cursor.fetchall()
 
-        print("\n=== LIBROS CON SUS AUTORES ===")
-        for titulo, anio, autor in libros:
-            print(f"- {titulo} ({anio}) - {autor}")
+        # Se compone todo el listado y se escribe de una vez
+        sys.stdout.write(
+            "\n=== LIBROS CON SUS AUTORES ===\n"
+            + "".join(
+                f"- {titulo} ({anio}) - {autor}\n" for titulo, anio, autor in libros
+            )
+        )
 
     except sqlite3.Error as e:
         print(f"Error al consultar libros: {e}")
@@ -143,15 +261,7 @@ def buscar_libros_por_autor(conexion, nombre_autor):
     # Retorna una lista de tuplas (titulo, anio)
     try:
         cursor = conexion.cursor()
-        cursor.execute(
-            """
-            SELECT l.titulo, l.anio
-            FROM libros l
-            JOIN autores a ON l.autor_id = a.id
-            WHERE a.nombre = ?
-        """,
-            (nombre_autor,),
-        )
+        cursor.execute(_SQL_LIBROS_POR_AUTOR, (nombre_autor,))
 
         libros = cursor.fetchall()
         return libros
@@ -161,57 +271,50 @@ def buscar_libros_por_autor(conexion, nombre_autor):
         return []
 
 
-def actualizar_libro(conexion, id_libro, nuevo_titulo=None, nuevo_anio=None):
+def actualizar_libro(
+    conexion, id_libro, nuevo_titulo=None, nuevo_anio=None, commit=True
+):
     """
     Actualiza la información de un libro existente
+    Parámetro commit: False si la transacción la gestiona quien llama
     """
     # Implementa la actualización usando SQL UPDATE
     # Solo actualiza los campos que no son None
+    if nuevo_titulo is None and nuevo_anio is None:
+        print("No se proporcionaron campos para actualizar.")
+        return
+
     try:
         cursor = conexion.cursor()
 
-        # Construir la consulta dinámicamente según qué campos actualizar
-        campos_a_actualizar = []
-        valores = []
-
-        if nuevo_titulo is not None:
-            campos_a_actualizar.append("titulo = ?")
-            valores.append(nuevo_titulo)
-
-        if nuevo_anio is not None:
-            campos_a_actualizar.append("anio = ?")
-            valores.append(nuevo_anio)
-
-        if campos_a_actualizar:
-            consulta = (
-                f"UPDATE libros SET {', '.join(campos_a_actualizar)} WHERE id = ?"
-            )
-            valores.append(id_libro)
-
-            cursor.execute(consulta, valores)
+        # Los campos a None se pasan tal cual y COALESCE mantiene su valor
+        cursor.execute(_UPDATE_LIBRO, (nuevo_titulo, nuevo_anio, id_libro))
+        if commit:
             conexion.commit()
 
-            if cursor.rowcount > 0:
-                print(f"Libro con ID {id_libro} actualizado correctamente.")
-            else:
-                print(f"No se encontró ningún libro con ID {id_libro}.")
+        if cursor.rowcount > 0:
+            print(f"Libro con ID {id_libro} actualizado correctamente.")
         else:
-            print("No se proporcionaron campos para actualizar.")
+            print(f"No se encontró ningún libro con ID {id_libro}.")
 
     except sqlite3.Error as e:
         print(f"Error al actualizar libro: {e}")
+        if not commit:
+            raise
         conexion.rollback()
 
 
-def eliminar_libro(conexion, id_libro):
+def eliminar_libro(conexion, id_libro, commit=True):
     """
     Elimina un libro por su ID
+    Parámetro commit: False si la transacción la gestiona quien llama
     """
     # Implementa la eliminación usando SQL DELETE
     try:
         cursor = conexion.cursor()
         cursor.execute("DELETE FROM libros WHERE id = ?", (id_libro,))
-        conexion.commit()
+        if commit:
+            conexion.commit()
 
         if cursor.rowcount > 0:
             print(f"Libro con ID {id_libro} eliminado correctamente.")
@@ -220,6 +323,8 @@ def eliminar_libro(conexion, id_libro):
 
     except sqlite3.Error as e:
         print(f"Error al eliminar libro: {e}")
+        if not commit:
+            raise
         conexion.rollback()
 
 
@@ -232,6 +337,9 @@ def ejemplo_transaccion(conexion):
     # 2. Realice varias operaciones
     # 3. Si todo está bien, confirma con conexion.commit()
     # 4. En caso de error, revierte con conexion.rollback()
+    # Nota: PRAGMA foreign_keys solo puede cambiarse fuera de una transacción.
+    # Para una carga masiva sin comprobar claves foráneas, se desactivan antes
+    # del BEGIN y se restauran tras el commit (ver sin_claves_foraneas)
     try:
         cursor = conexion.cursor()
 
@@ -268,16 +376,11 @@ if __name__ == "__main__":
         print("Creando tablas...")
         crear_tablas(conexion)
 
-        # Insertar autores
         autores = [
             ("Gabriel García Márquez",),
             ("Isabel Allende",),
             ("Jorge Luis Borges",),
         ]
-        insertar_autores(conexion, autores)
-        print("Autores insertados correctamente")
-
-        # Insertar libros
         libros = [
             ("Cien años de soledad", 1967, 1),
             ("El amor en los tiempos del cólera", 1985, 1),
@@ -286,8 +389,15 @@ if __name__ == "__main__":
             ("Ficciones", 1944, 3),
             ("El Aleph", 1949, 3),
         ]
-        insertar_libros(conexion, libros)
-        print("Libros insertados correctamente")
+
+        # Insertar autores y libros en una única transacción (un solo commit)
+        # y sin comprobar claves foráneas, ya que los datos son de confianza
+        with sin_claves_foraneas(conexion), transaccion(conexion):
+            insertar_autores(conexion, autores, commit=False)
+            print("Autores insertados correctamente")
+
+            insertar_libros(conexion, libros, commit=False)
+            print("Libros insertados correctamente")
 
         print("\n--- Lista de todos los libros con sus autores ---")
         consultar_libros(conexion)
@@ -296,20 +406,27 @@ if __name__ == "__main__":
         nombre_autor = "Gabriel García Márquez"
         libros_autor = buscar_libros_por_autor(conexion, nombre_autor)
         print(f"Libros de {nombre_autor}:")
-        for titulo, anio in libros_autor:
-            print(f"- {titulo} ({anio})")
-
-        print("\n--- Actualización de un libro ---")
-        actualizar_libro(
-            conexion, 1, nuevo_titulo="Cien años de soledad (Edición especial)"
+        sys.stdout.write(
+            "".join(f"- {titulo} ({anio})\n" for titulo, anio in libros_autor)
         )
-        print("Libro actualizado. Nueva información:")
-        consultar_libros(conexion)
 
-        print("\n--- Eliminación de un libro ---")
-        eliminar_libro(conexion, 6)  # Elimina "El Aleph"
-        print("Libro eliminado. Lista actualizada:")
-        consultar_libros(conexion)
+        # Actualización y eliminación en una única transacción (un solo commit);
+        # las consultas intermedias ya ven los cambios pendientes
+        with transaccion(conexion):
+            print("\n--- Actualización de un libro ---")
+            actualizar_libro(
+                conexion,
+                1,
+                nuevo_titulo="Cien años de soledad (Edición especial)",
+                commit=False,
+            )
+            print("Libro actualizado. Nueva información:")
+            consultar_libros(conexion)
+
+            print("\n--- Eliminación de un libro ---")
+            eliminar_libro(conexion, 6, commit=False)  # Elimina "El Aleph"
+            print("Libro eliminado. Lista actualizada:")
+            consultar_libros(conexion)
 
         print("\n--- Demostración de transacción ---")
         ejemplo_transaccion(conexion)
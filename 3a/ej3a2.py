@@ -14,6 +14,7 @@ Debes crear una base de datos a partir de este script y realizar operaciones sob
 
 import os
 import sqlite3
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
 # Ruta al archivo SQL
@@ -21,6 +22,99 @@ SQL_FILE_PATH = os.path.join(os.path.dirname(__file__), "test.sql")
 # Ruta para la base de datos SQLite
 DB_PATH = os.path.join(os.path.dirname(__file__), "biblioteca.db")
 
+# Ajustes de rendimiento aplicados a cada conexión nueva
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Tamaño de la caché de sentencias preparadas de cada conexión
+CACHED_STATEMENTS = 256
+
+# Imagen serializada de la base de datos creada a partir de SQL_FILE_PATH
+# (ver _obtener_plantilla)
+_plantilla: Optional[bytes] = None
+
+# Consultas fijas: usar siempre el mismo texto SQL permite reutilizar la
+# sentencia ya compilada en la caché de la conexión
+_SQL_OBTENER_LIBROS = """
+    SELECT l.id, l.titulo, l.anio, a.nombre
+    FROM libros l
+    JOIN autores a ON l.autor_id = a.id
+    ORDER BY l.id
+"""
+
+_SQL_OBTENER_AUTORES = """
+    SELECT id, nombre
+    FROM autores
+    ORDER BY id
+"""
+
+# Índices que el script SQL no define: la clave foránea de libros (JOIN con
+# autores) y el nombre del autor (búsquedas por nombre)
+_SQL_INDICES = """
+    CREATE INDEX IF NOT EXISTS idx_libros_autor ON libros (autor_id);
+    CREATE INDEX IF NOT EXISTS idx_autores_nombre ON autores (nombre);
+"""
+
+_SQL_AGREGAR_LIBRO = """
+    INSERT INTO libros (titulo, anio, autor_id)
+    VALUES (?, ?, ?)
+"""
+
+# Una única sentencia UPDATE para cualquier combinación de campos: si un
+# parámetro es NULL, COALESCE conserva el valor actual de la columna
+_UPDATE_LIBRO = """
+    UPDATE libros
+    SET titulo = COALESCE(?, titulo),
+        anio = COALESCE(?, anio),
+        autor_id = COALESCE(?, autor_id)
+    WHERE id = ?
+"""
+
+
+def _aplicar_pragmas(conexion: sqlite3.Connection) -> None:
+    """
+    Configura la conexión con los PRAGMAs de PRAGMAS (modo WAL, sincronización
+    NORMAL, tablas temporales en memoria, caché de páginas y mmap)
+    """
+    for pragma in PRAGMAS:
+        conexion.execute(pragma)
+
+
+def _obtener_plantilla() -> bytes:
+    """
+    Devuelve la base de datos de SQL_FILE_PATH (con sus índices) serializada.
+    El script solo se lee y ejecuta, sobre una base de datos en memoria, la
+    primera vez; las siguientes llamadas reutilizan la imagen ya construida
+
+    Returns:
+        bytes: Contenido de la base de datos tal como lo devuelve serialize()
+    """
+    global _plantilla
+    if _plantilla is None:
+        # Se abre directamente el archivo (sin comprobar antes si existe): es
+        # la única lectura del script en todo el proceso
+        try:
+            with open(SQL_FILE_PATH, "r", encoding="utf-8") as archivo_sql:
+                script_sql = archivo_sql.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No se encontró el archivo SQL: {SQL_FILE_PATH}"
+            ) from None
+
+        memoria = sqlite3.connect(":memory:")
+        try:
+            memoria.executescript(script_sql)
+            memoria.executescript(_SQL_INDICES)
+            _plantilla = memoria.serialize()
+        finally:
+            memoria.close()
+    return _plantilla
+
 
 def crear_bd_desde_sql() -> sqlite3.Connection:
     """
@@ -36,6 +130,8 @@ def crear_bd_desde_sql() -> sqlite3.Connection:
     # 4. Ejecuta el script SQL completo
     # 5. Haz commit de los cambios
     # 6. Devuelve la conexión
+    # Los pasos 3 y 4 solo se hacen la primera vez (ver _obtener_plantilla);
+    # después se copian directamente las páginas de la base de datos ya creada
 
     try:
         # 1. Si el archivo de base de datos existe, elimínalo
@@ -43,20 +139,19 @@ def crear_bd_desde_sql() -> sqlite3.Connection:
             os.remove(DB_PATH)
 
         # 2. Conecta a la base de datos (se creará si no existe)
-        conexion = sqlite3.connect(DB_PATH)
+        conexion = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
 
-        # 3. Lee el contenido del archivo SQL
-        if os.path.exists(SQL_FILE_PATH):
-            with open(SQL_FILE_PATH, "r", encoding="utf-8") as archivo_sql:
-                script_sql = archivo_sql.read()
-
-            # 4. Ejecuta el script SQL completo
-            conexion.executescript(script_sql)
+        # 3 y 4. Obtener la base de datos creada con el script SQL y copiarla
+        #        al archivo con la API de backup
+        memoria = sqlite3.connect(":memory:")
+        try:
+            memoria.deserialize(_obtener_plantilla())
+            # 5. backup() escribe y confirma las páginas en el destino
+            memoria.backup(conexion)
+        finally:
+            memoria.close()
 
-            # 5. Haz commit de los cambios
-            conexion.commit()
-        else:
-            raise FileNotFoundError(f"No se encontró el archivo SQL: {SQL_FILE_PATH}")
+        _aplicar_pragmas(conexion)
 
         # 6. Devuelve la conexión
         return conexion
@@ -88,12 +183,7 @@ def obtener_libros(conexion: sqlite3.Connection) -> List[Tuple]:
         cursor = conexion.cursor()
 
         # 2. Ejecutar consulta JOIN
-        cursor.execute("""
-            SELECT l.id, l.titulo, l.anio, a.nombre
-            FROM libros l
-            JOIN autores a ON l.autor_id = a.id
-            ORDER BY l.id
-        """)
+        cursor.execute(_SQL_OBTENER_LIBROS)
 
         # 3. Retornar resultados como lista de tuplas
         return cursor.fetchall()
@@ -129,13 +219,7 @@ def agregar_libro(
         cursor = conexion.cursor()
 
         # 2. Ejecutar INSERT INTO
-        cursor.execute(
-            """
-            INSERT INTO libros (titulo, anio, autor_id)
-            VALUES (?, ?, ?)
-        """,
-            (titulo, anio, autor_id),
-        )
+        cursor.execute(_SQL_AGREGAR_LIBRO, (titulo, anio, autor_id))
 
         # 3. Hacer commit
         conexion.commit()
@@ -170,48 +254,30 @@ def actualizar_libro(
         bool: True si se actualizó correctamente, False si no se encontró el libro
     """
     # Implementa aquí la actualización del libro:
+    # 0. Si no hay campos que actualizar, retorna False sin tocar la base de datos
     # 1. Crea un cursor a partir de la conexión
-    # 2. Verifica primero que el libro existe
-    # 3. Prepara la consulta UPDATE con los campos que no son None
-    # 4. Ejecuta la consulta y haz commit de los cambios
-    # 5. Retorna True si se modificó alguna fila, False en caso contrario
+    # 2. Prepara los parámetros del UPDATE (los campos a None no se modifican)
+    # 3. Ejecuta la consulta y haz commit de los cambios
+    # 4. Retorna True si se modificó alguna fila, False en caso contrario
+    #    (si el libro no existe, el UPDATE no afecta a ninguna fila)
+
+    # 0. Salir antes de crear el cursor si no hay campos para actualizar
+    if nuevo_titulo is None and nuevo_anio is None and nuevo_autor_id is None:
+        return False
 
     try:
         # 1. Crear cursor
         cursor = conexion.cursor()
 
-        # 2. Verificar que el libro existe
-        cursor.execute("SELECT id FROM libros WHERE id = ?", (libro_id,))
-        if cursor.fetchone() is None:
-            return False
-
-        # 3. Preparar consulta UPDATE dinámicamente
-        campos_a_actualizar = []
-        valores = []
-
-        if nuevo_titulo is not None:
-            campos_a_actualizar.append("titulo = ?")
-            valores.append(nuevo_titulo)
-
-        if nuevo_anio is not None:
-            campos_a_actualizar.append("anio = ?")
-            valores.append(nuevo_anio)
-
-        if nuevo_autor_id is not None:
-            campos_a_actualizar.append("autor_id = ?")
-            valores.append(nuevo_autor_id)
+        # 2. Preparar los parámetros: COALESCE mantiene los campos a None
+        valores = (nuevo_titulo, nuevo_anio, nuevo_autor_id, libro_id)
 
-        if not campos_a_actualizar:
-            return False  # No hay campos para actualizar
-
-        # 4. Ejecutar consulta y hacer commit
-        consulta = f"UPDATE libros SET {', '.join(campos_a_actualizar)} WHERE id = ?"
-        valores.append(libro_id)
-
-        cursor.execute(consulta, valores)
+        # 3. Ejecutar consulta y hacer commit
+        cursor.execute(_UPDATE_LIBRO, valores)
         conexion.commit()
 
-        # 5. Retornar True si se modificó alguna fila
+        # 4. Retornar True si se modificó alguna fila (rowcount es 0 si el
+        #    libro no existe, así que no hace falta comprobarlo antes)
         return cursor.rowcount > 0
 
     except sqlite3.Error as e:
@@ -220,6 +286,22 @@ def actualizar_libro(
         return False
 
 
+def formatear_libros(libros: List[Tuple]) -> str:
+    """
+    Da formato a una lista de libros para mostrarla de una sola vez
+
+    Args:
+        libros (List[Tuple]): Lista de tuplas (id, titulo, anio, autor)
+
+    Returns:
+        str: Una línea por libro, cada una terminada en salto de línea
+    """
+    return "".join(
+        f"ID: {libro_id} - {titulo} ({anio}) de {autor}\n"
+        for libro_id, titulo, anio, autor in libros
+    )
+
+
 def obtener_autores(conexion: sqlite3.Connection) -> List[Tuple]:
     """
     Obtiene la lista de autores
@@ -240,11 +322,7 @@ def obtener_autores(conexion: sqlite3.Connection) -> List[Tuple]:
         cursor = conexion.cursor()
 
         # 2. Ejecutar consulta SELECT
-        cursor.execute("""
-            SELECT id, nombre
-            FROM autores
-            ORDER BY id
-        """)
+        cursor.execute(_SQL_OBTENER_AUTORES)
 
         # 3. Retornar resultados como lista de tuplas
         return cursor.fetchall()
@@ -270,15 +348,14 @@ if __name__ == "__main__":
         # Mostrar los autores disponibles
         print("\n--- Autores disponibles ---")
         autores = obtener_autores(conexion)
-        for autor_id, nombre in autores:
-            print(f"ID: {autor_id} - {nombre}")
+        sys.stdout.write(
+            "".join(f"ID: {autor_id} - {nombre}\n" for autor_id, nombre in autores)
+        )
 
         # Mostrar los datos de libros y autores
         print("\n--- Libros y autores en la base de datos ---")
         libros = obtener_libros(conexion)
-        for libro in libros:
-            libro_id, titulo, anio, autor = libro
-            print(f"ID: {libro_id} - {titulo} ({anio}) de {autor}")
+        sys.stdout.write(formatear_libros(libros))
 
         # Agregar un nuevo libro
         print("\n--- Agregar un nuevo libro ---")
@@ -293,9 +370,7 @@ if __name__ == "__main__":
         # Mostrar la lista actualizada de libros
         print("\n--- Lista actualizada de libros ---")
         libros = obtener_libros(conexion)
-        for libro in libros:
-            libro_id, titulo, anio, autor = libro
-            print(f"ID: {libro_id} - {titulo} ({anio}) de {autor}")
+        sys.stdout.write(formatear_libros(libros))
 
         # Actualizar un libro
         print("\n--- Actualizar un libro existente ---")
@@ -314,9 +389,7 @@ if __name__ == "__main__":
         # Mostrar la lista final de libros
         print("\n--- Lista final de libros ---")
         libros = obtener_libros(conexion)
-        for libro in libros:
-            libro_id, titulo, anio, autor = libro
-            print(f"ID: {libro_id} - {titulo} ({anio}) de {autor}")
+        sys.stdout.write(formatear_libros(libros))
 
     except sqlite3.Error as e:
         print(f"Error de SQLite: {e}")
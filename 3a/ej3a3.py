@@ -14,12 +14,73 @@ usando diferentes técnicas.
 import json
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple, Union
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 import pandas as pd
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "ventas_comerciales.db")
 
+# Ajustes de rendimiento aplicados a cada conexión nueva. Todos afectan solo a
+# la conexión: ninguno cambia el archivo ventas_comerciales.db (journal_mode=WAL
+# sí quedaría grabado en él)
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Tamaño de la caché de sentencias preparadas de cada conexión
+CACHED_STATEMENTS = 256
+
+# Hilos (y conexiones de solo lectura) usados para leer tablas en paralelo
+MAX_HILOS = 4
+
+# Tamaño mínimo de la base de datos, en páginas, para leer en paralelo. Por
+# debajo, abrir las conexiones y el ThreadPoolExecutor cuesta más que las
+# lecturas que se reparten (ventas_comerciales.db ocupa 8 páginas)
+MIN_PAGINAS_PARALELO = 16384
+
+# Consultas JOIN de convertir_a_dataframes: al ser texto constante reutilizan
+# la sentencia compilada de la caché de la conexión
+_JOIN_SQL_VENTAS_PRODUCTOS = """
+    SELECT v.*, p.nombre as producto_nombre, p.categoria, p.precio_unitario
+    FROM ventas v
+    JOIN productos p ON v.producto_id = p.id
+"""
+
+_JOIN_SQL_VENTAS_VENDEDORES = """
+    SELECT v.*, vd.nombre as vendedor_nombre, r.nombre as region_nombre, r.pais
+    FROM ventas v
+    JOIN vendedores vd ON v.vendedor_id = vd.id
+    JOIN regiones r ON vd.region_id = r.id
+"""
+
+_JOIN_SQL_VENDEDORES_REGIONES = """
+    SELECT vd.*, r.nombre as region_nombre, r.pais
+    FROM vendedores vd
+    JOIN regiones r ON vd.region_id = r.id
+"""
+
+# (nombre del DataFrame, consulta) de cada JOIN de convertir_a_dataframes
+JOINS = (
+    ("ventas_productos", _JOIN_SQL_VENTAS_PRODUCTOS),
+    ("ventas_vendedores", _JOIN_SQL_VENTAS_VENDEDORES),
+    ("vendedores_regiones", _JOIN_SQL_VENDEDORES_REGIONES),
+)
+
+
+def _aplicar_pragmas(conexion: sqlite3.Connection) -> None:
+    """
+    Configura la conexión con los PRAGMAs de PRAGMAS (sincronización NORMAL,
+    tablas temporales en memoria, caché de páginas y mmap)
+    """
+    for pragma in PRAGMAS:
+        conexion.execute(pragma)
+
 
 def conectar_bd() -> sqlite3.Connection:
     """
@@ -40,7 +101,8 @@ def conectar_bd() -> sqlite3.Connection:
         #     raise FileNotFoundError(f"No se encontró el archivo de base de datos: {DB_PATH}")
 
         # 2. Conecta a la base de datos (se creará si no existe)
-        conexion = sqlite3.connect(DB_PATH)
+        conexion = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+        _aplicar_pragmas(conexion)
 
         # 3. Configurar la conexión para que devuelva las filas como diccionarios
         conexion.row_factory = sqlite3.Row
@@ -53,6 +115,75 @@ def conectar_bd() -> sqlite3.Connection:
         raise
 
 
+def _leer_sql(conexion: sqlite3.Connection, query: str) -> pd.DataFrame:
+    """
+    Ejecuta una consulta sobre la conexión y devuelve un DataFrame
+    con columnas de tipos de Arrow (double[pyarrow], string[pyarrow]...).
+    Guardar el texto en búferes de Arrow, en lugar de un objeto de Python por
+    celda en columnas object, reduce la memoria del DataFrame resultante. Si
+    la consulta no devuelve filas, SQLite no informa de tipos y las columnas
+    quedan como object
+    """
+    return pd.read_sql_query(query, conexion, dtype_backend="pyarrow")
+
+
+def _leer_registros(conexion: sqlite3.Connection, query: str) -> List[Dict[str, Any]]:
+    """
+    Ejecuta una consulta y devuelve sus filas como diccionarios. Las filas se
+    obtienen como sqlite3.Row, que ya conoce los nombres de las columnas, así
+    que dict(row) no necesita recorrer cursor.description
+    """
+    cursor = conexion.cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute(query)
+    return [dict(fila) for fila in cursor]
+
+
+def _leer_en_paralelo(
+    conexion: sqlite3.Connection,
+    consultas: List[str],
+    leer: Callable[[sqlite3.Connection, str], Any],
+) -> List[Any]:
+    """
+    Aplica leer(conexion, consulta) a cada consulta y devuelve los resultados en
+    el mismo orden. Si la base de datos está en un archivo, cada consulta usa
+    su propia conexión de solo lectura en un hilo de un ThreadPoolExecutor:
+    sqlite3 libera el GIL mientras SQLite ejecuta la consulta y los lectores
+    solo toman bloqueos compartidos, que no se bloquean entre sí. Esas
+    conexiones solo ven datos ya confirmados, así que si la conexión tiene una
+    transacción abierta (o la base de datos está en memoria) se usa la propia
+    conexión, que sí ve sus cambios pendientes. También se lee en serie con la
+    propia conexión si la base de datos tiene menos de MIN_PAGINAS_PARALELO
+    páginas
+    """
+    ruta = next(
+        (
+            fila[2]
+            for fila in conexion.execute("PRAGMA database_list")
+            if fila[1] == "main"
+        ),
+        "",
+    )
+    paginas = conexion.execute("PRAGMA page_count").fetchone()[0]
+    if not ruta or conexion.in_transaction or paginas < MIN_PAGINAS_PARALELO:
+        return [leer(conexion, consulta) for consulta in consultas]
+
+    def leer_con_conexion_propia(consulta: str) -> Any:
+        lectora = sqlite3.connect(
+            f"file:{quote(ruta)}?mode=ro",
+            uri=True,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        try:
+            lectora.execute("PRAGMA query_only=1")
+            return leer(lectora, consulta)
+        finally:
+            lectora.close()
+
+    with ThreadPoolExecutor(max_workers=MAX_HILOS) as ejecutor:
+        return list(ejecutor.map(leer_con_conexion_propia, consultas))
+
+
 def convertir_a_json(conexion: sqlite3.Connection) -> Dict[str, List[Dict[str, Any]]]:
     """
     Convierte los datos de la base de datos en un objeto compatible con JSON
@@ -85,25 +216,14 @@ def convertir_a_json(conexion: sqlite3.Connection) -> Dict[str, List[Dict[str, A
         )
         tablas = [tabla[0] for tabla in cursor.fetchall()]
 
-        # 3. Para cada tabla:
-        for tabla in tablas:
-            # 3a. Ejecutar una consulta SELECT * FROM tabla
-            cursor.execute(f"SELECT * FROM {tabla}")
-            filas = cursor.fetchall()
+        # 3. Para cada tabla, en paralelo (ver _leer_en_paralelo):
+        #    a. Ejecutar una consulta SELECT * FROM tabla
+        #    b/c. Convertir cada fila a un diccionario con dict(row)
+        consultas = [f"SELECT * FROM {tabla}" for tabla in tablas]
+        registros = _leer_en_paralelo(conexion, consultas, _leer_registros)
 
-            # 3b. Obtener los nombres de las columnas
-            columnas = [descripcion[0] for descripcion in cursor.description]
-
-            # 3c. Convertir cada fila a un diccionario
-            registros = []
-            for fila in filas:
-                registro = {}
-                for i, columna in enumerate(columnas):
-                    registro[columna] = fila[i]
-                registros.append(registro)
-
-            # 3d. Añadir el diccionario a una lista para esa tabla
-            datos_json[tabla] = registros
+        #    d. Añadir la lista de diccionarios de cada tabla
+        datos_json.update(zip(tablas, registros))
 
         # 4. Retornar el diccionario completo con todas las tablas
         return datos_json
@@ -127,7 +247,7 @@ def convertir_a_dataframes(conexion: sqlite3.Connection) -> Dict[str, pd.DataFra
     # Implementa aquí la extracción de datos a DataFrames:
     # 1. Crea un diccionario vacío para los DataFrames
     # 2. Obtén la lista de tablas de la base de datos
-    # 3. Para cada tabla, crea un DataFrame usando pd.read_sql_query
+    # 3. Para cada tabla, crea un DataFrame a partir de un SELECT *
     # 4. Añade consultas JOIN para relaciones importantes:
     #    - Ventas con información de productos
     #    - Ventas con información de vendedores
@@ -144,41 +264,22 @@ def convertir_a_dataframes(conexion: sqlite3.Connection) -> Dict[str, pd.DataFra
         tablas = cursor.fetchall()
         nombres_tablas = [tabla[0] for tabla in tablas]
 
-        # 3. Para cada tabla, crear DataFrame usando pd.read_sql_query
-        for nombre_tabla in nombres_tablas:
-            query = f"SELECT * FROM {nombre_tabla}"
-            df = pd.read_sql_query(query, conexion)
-            dataframes[nombre_tabla] = df
-
-        # 4. Añadir consultas JOIN para relaciones importantes:
-
-        # - Ventas con información de productos
-        query_ventas_productos = """
-            SELECT v.*, p.nombre as producto_nombre, p.categoria, p.precio_unitario
-            FROM ventas v
-            JOIN productos p ON v.producto_id = p.id
-        """
-        df_ventas_productos = pd.read_sql_query(query_ventas_productos, conexion)
-        dataframes["ventas_productos"] = df_ventas_productos
-
-        # - Ventas con información de vendedores
-        query_ventas_vendedores = """
-            SELECT v.*, vd.nombre as vendedor_nombre, r.nombre as region_nombre, r.pais
-            FROM ventas v
-            JOIN vendedores vd ON v.vendedor_id = vd.id
-            JOIN regiones r ON vd.region_id = r.id
-        """
-        df_ventas_vendedores = pd.read_sql_query(query_ventas_vendedores, conexion)
-        dataframes["ventas_vendedores"] = df_ventas_vendedores
-
-        # - Vendedores con regiones
-        query_vendedores_regiones = """
-            SELECT vd.*, r.nombre as region_nombre, r.pais
-            FROM vendedores vd
-            JOIN regiones r ON vd.region_id = r.id
-        """
-        df_vendedores_regiones = pd.read_sql_query(query_vendedores_regiones, conexion)
-        dataframes["vendedores_regiones"] = df_vendedores_regiones
+        # 3. Para cada tabla, un SELECT * FROM tabla
+        nombres = list(nombres_tablas)
+        consultas = [f"SELECT * FROM {nombre_tabla}" for nombre_tabla in nombres_tablas]
+
+        # 4. Añadir consultas JOIN para relaciones importantes (ver JOINS):
+        #    - Ventas con información de productos
+        #    - Ventas con información de vendedores
+        #    - Vendedores con regiones
+        for nombre, consulta in JOINS:
+            nombres.append(nombre)
+            consultas.append(consulta)
+
+        # Crear todos los DataFrames en paralelo (ver _leer_en_paralelo)
+        dataframes.update(
+            zip(nombres, _leer_en_paralelo(conexion, consultas, _leer_sql))
+        )
 
         # 5. Retornar el diccionario con todos los DataFrames
         return dataframes
@@ -223,10 +324,14 @@ if __name__ == "__main__":
         dataframes = convertir_a_dataframes(conexion)
         if dataframes:
             print(f"Se han creado {len(dataframes)} DataFrames:")
-            for nombre, df in dataframes.items():
-                print(f"- {nombre}: {len(df)} filas x {len(df.columns)} columnas")
-                print(f"  Columnas: {', '.join(df.columns.tolist())}")
-                print(f"  Vista previa:\n{df.head(2)}\n")
+            sys.stdout.write(
+                "".join(
+                    f"- {nombre}: {len(df)} filas x {len(df.columns)} columnas\n"
+                    f"  Columnas: {', '.join(df.columns.tolist())}\n"
+                    f"  Vista previa:\n{df.head(2)}\n\n"
+                    for nombre, df in dataframes.items()
+                )
+            )
 
     except sqlite3.Error as e:
         print(f"Error de SQLite: {e}")
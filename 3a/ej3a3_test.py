@@ -313,3 +313,43 @@ def test_convertir_a_dataframes_data(conexion_bd):
         df_join = dataframes[df_join_name]
         # Un DataFrame con join debería tener más columnas que las tablas individuales
         assert len(df_join.columns) > len(dataframes["ventas"].columns), f"El DataFrame {df_join_name} no parece contener un join válido"
+
+def test_convertir_a_dataframes_con_conexion_propia():
+    """
+    Prueba convertir_a_dataframes con una conexión abierta directamente con
+    sqlite3.connect, sin pasar por conectar_bd
+    """
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        dataframes = convertir_a_dataframes(conn)
+
+        # Las consultas combinadas no deben depender de cómo se abrió la conexión
+        for nombre in ["ventas_productos", "ventas_vendedores", "vendedores_regiones"]:
+            assert nombre in dataframes, f"No se encontró el DataFrame {nombre}"
+            assert len(dataframes[nombre]) > 0
+
+    finally:
+        conn.close()
+
+def test_conversiones_ven_cambios_sin_confirmar(conexion_bd):
+    """
+    Prueba que convertir_a_json y convertir_a_dataframes ven los cambios aún no
+    confirmados de la conexión que reciben
+    """
+    cursor = conexion_bd.cursor()
+    cursor.execute("SELECT COUNT(*) FROM regiones;")
+    total_inicial = cursor.fetchone()[0]
+
+    try:
+        cursor.execute(
+            "INSERT INTO regiones (nombre, pais) VALUES (?, ?)", ("Prueba", "España")
+        )
+        assert conexion_bd.in_transaction
+
+        assert len(convertir_a_json(conexion_bd)["regiones"]) == total_inicial + 1
+        assert len(convertir_a_dataframes(conexion_bd)["regiones"]) == total_inicial + 1
+
+    finally:
+        # No dejar cambios en la base de datos de prueba
+        conexion_bd.rollback()
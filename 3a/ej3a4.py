@@ -13,19 +13,95 @@ Tareas:
 Este ejercicio se enfoca en las operaciones básicas de MongoDB desde Python utilizando PyMongo.
 """
 
+import atexit
 import os
 import shutil
+import socket
 import subprocess
 import sys
+import threading
 import time
+import warnings
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pymongo
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
+from pymongo import DeleteOne, UpdateOne, WriteConcern
+from pymongo.errors import BulkWriteError, PyMongoError
 
 # Configuración de MongoDB
 DB_NAME = "biblioteca"
 MONGODB_PORT = 27017
+TEMP_DIR = os.path.join(os.path.dirname(__file__), "temp_mongodb")
+
+# Nombres de los índices creados en crear_colecciones
+INDICE_AUTOR_ID = "autor_id_1"
+INDICE_NOMBRE = "nombre_1"
+INDICE_TITULO = "titulo_1"
+
+# Compresión del protocolo en orden de preferencia; PyMongo descarta las que
+# no tengan instalado su módulo (zlib siempre está disponible)
+COMPRESORES = "zstd,snappy,zlib"
+
+# Las cargas masivas se confirman sin esperar al journal
+ESCRITURA_CARGA = WriteConcern(w=1, j=False)
+
+# Documentos por lote al recorrer cursores con muchos resultados y al insertar
+# grandes cantidades de documentos
+TAMANO_LOTE = 500
+
+# Agregación para obtener libros con información de autores: se ordena antes
+# del $lookup, sobre el índice de titulo, para que la unión reciba los libros
+# ya ordenados; el $lookup solo trae el nombre del autor y se toma el primero
+# con $first en lugar de desplegar el array con $unwind
+_PIPELINE_LIBROS_CON_AUTORES = [
+    {"$sort": {"titulo": 1}},
+    {
+        "$lookup": {
+            "from": "autores",
+            "localField": "autor_id",
+            "foreignField": "_id",
+            "as": "autor",
+            "pipeline": [{"$project": {"nombre": 1, "_id": 0}}],
+        }
+    },
+    # Como hacía $unwind, se descartan los libros cuyo autor no existe
+    {"$match": {"autor": {"$ne": []}}},
+    {"$set": {"autor_nombre": {"$first": "$autor.nombre"}}},
+    {"$project": {"titulo": 1, "anio": 1, "autor_nombre": 1}},
+]
+
+# Etapa común a las búsquedas por autor: une cada autor con sus libros
+_LOOKUP_LIBROS_DEL_AUTOR = {
+    "$lookup": {
+        "from": "libros",
+        "localField": "_id",
+        "foreignField": "autor_id",
+        "as": "libros",
+        "pipeline": [{"$project": {"_id": 0, "titulo": 1, "anio": 1}}],
+    }
+}
+
+# Cliente compartido por el proceso, con su propio pool de conexiones
+# (ver crear_conexion)
+_cliente: Optional[pymongo.MongoClient] = None
+_cliente_lock = threading.Lock()
+
+
+def _a_object_id(valor: Union[str, ObjectId]) -> ObjectId:
+    """
+    Devuelve el valor como ObjectId, sin volver a parsearlo si ya lo es
+
+    Args:
+        valor: ObjectId o su representación hexadecimal
+
+    Returns:
+        El ObjectId correspondiente
+    """
+    return valor if isinstance(valor, ObjectId) else ObjectId(valor)
 
 
 def verificar_mongodb_instalado() -> bool:
@@ -34,11 +110,12 @@ def verificar_mongodb_instalado() -> bool:
     """
     try:
         # Intentamos ejecutar mongod --version para verificar que está instalado
+        # (solo importa el código de salida, así que se descarta la salida)
         result = subprocess.run(
             ["mongod", "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
         )
         return result.returncode == 0
     except FileNotFoundError:
@@ -50,8 +127,7 @@ def iniciar_mongodb_en_memoria() -> Optional[subprocess.Popen]:
     Inicia una instancia de MongoDB en memoria para pruebas
     """
     # Crear directorio temporal para MongoDB
-    temp_dir = os.path.join(os.path.dirname(__file__), "temp_mongodb")
-    os.makedirs(temp_dir, exist_ok=True)
+    os.makedirs(TEMP_DIR, exist_ok=True)
 
     # Iniciar MongoDB con almacenamiento en memoria
     cmd = [
@@ -59,18 +135,28 @@ def iniciar_mongodb_en_memoria() -> Optional[subprocess.Popen]:
         "--storageEngine",
         "inMemory",
         "--dbpath",
-        temp_dir,
+        TEMP_DIR,
         "--port",
         str(MONGODB_PORT),
     ]
 
     try:
+        # La salida no se lee: con PIPE, mongod acabaría bloqueado al llenarse
+        # el búfer de la tubería
         proceso = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
 
-        # Dar tiempo para que MongoDB se inicie
-        time.sleep(2)
+        # Esperar a que MongoDB acepte conexiones (hasta ~5 s) en lugar de
+        # una pausa fija, abandonando si el proceso termina antes
+        for _ in range(100):
+            if proceso.poll() is not None:
+                break
+            try:
+                with socket.create_connection(("localhost", MONGODB_PORT), timeout=0.1):
+                    break
+            except OSError:
+                time.sleep(0.05)
 
         # Verificar que MongoDB se ha iniciado correctamente
         if proceso.poll() is not None:
@@ -79,25 +165,42 @@ def iniciar_mongodb_en_memoria() -> Optional[subprocess.Popen]:
         return proceso
     except Exception as e:
         print(f"Error al iniciar MongoDB: {e}")
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
         return None
 
 
 def crear_conexion() -> pymongo.database.Database:
     """
-    Crea y devuelve una conexión a la base de datos MongoDB
+    Crea y devuelve una conexión a la base de datos MongoDB. El MongoClient se
+    crea la primera vez y se reutiliza en las siguientes llamadas, de modo que
+    su pool de conexiones se comparte; se cierra al terminar el intérprete
     """
+    global _cliente
     try:
-        # Crear conexión a MongoDB
-        cliente = pymongo.MongoClient(f"mongodb://localhost:{MONGODB_PORT}/")
+        # Crear el cliente de MongoDB solo la primera vez
+        with _cliente_lock:
+            if _cliente is None:
+                # Se silencia el aviso de PyMongo por cada compresor no disponible
+                with warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        "ignore",
+                        message="Wire protocol compression",
+                        category=UserWarning,
+                    )
+                    _cliente = pymongo.MongoClient(
+                        f"mongodb://localhost:{MONGODB_PORT}/",
+                        maxPoolSize=50,
+                        minPoolSize=5,
+                        compressors=COMPRESORES,
+                    )
+                atexit.register(_cliente.close)
 
         # Obtener la base de datos específica
-        db = cliente[DB_NAME]
+        db = _cliente[DB_NAME]
 
         return db
 
-    except Exception as e:
+    except PyMongoError as e:
         print(f"Error al conectar con MongoDB: {e}")
         raise
 
@@ -111,13 +214,24 @@ def crear_colecciones(db: pymongo.database.Database) -> None:
     Args:
         db: Objeto de conexión a la base de datos MongoDB
     """
-    # TODO: Implementar la creación de colecciones e índices
-    pass
+    # 1. Índice sobre la referencia al autor para que el $lookup use un índice
+    db.libros.create_index([("autor_id", 1)], name=INDICE_AUTOR_ID)
+
+    # 2. Índice único sobre el nombre para las búsquedas por autor
+    db.autores.create_index([("nombre", 1)], name=INDICE_NOMBRE, unique=True)
+
+    # 3. Índice sobre el título para que el $sort inicial del listado de
+    #    libros recorra el índice en lugar de ordenar en memoria
+    db.libros.create_index([("titulo", 1)], name=INDICE_TITULO)
+
+    # 4. Las colecciones pueden haberse recreado: descartar las consultas
+    #    memorizadas sobre los datos anteriores
+    limpiar_cache()
 
 
 def insertar_autores(
     db: pymongo.database.Database, autores: List[Tuple[str]]
-) -> List[str]:
+) -> List[ObjectId]:
     """
     Inserta varios autores en la colección 'autores'
 
@@ -128,29 +242,39 @@ def insertar_autores(
     # TODO: Implementar la inserción de autores
     try:
         # Preparar documentos para inserción
-        documentos = []
-        for nombre_tuple in autores:
-            documento = {"nombre": nombre_tuple[0]}
-            documentos.append(documento)
+        documentos = [{"nombre": nombre_tuple[0]} for nombre_tuple in autores]
 
-        # Insertar documentos y obtener IDs
-        resultado = db.autores.insert_many(documentos)
+        # Insertar documentos sin orden ni validación de esquema y obtener IDs
+        autores_carga = db.get_collection("autores", write_concern=ESCRITURA_CARGA)
+        try:
+            resultado = autores_carga.insert_many(
+                documentos, ordered=False, bypass_document_validation=True
+            )
+        finally:
+            # Los datos han cambiado (aunque sea en parte): invalidar las
+            # consultas memorizadas
+            limpiar_cache()
 
-        # Convertir ObjectId a string para compatibilidad
-        ids_insertados = [str(doc_id) for doc_id in resultado.inserted_ids]
+        # Se devuelven los ObjectId tal cual para usarlos como referencia
+        ids_insertados = resultado.inserted_ids
 
         print(f"Se insertaron {len(ids_insertados)} autores correctamente.")
 
         return ids_insertados
 
-    except Exception as e:
+    except BulkWriteError:
+        # Con ordered=False puede haber inserciones parciales: se propaga
+        # para que el llamador revise details["writeErrors"]
+        raise
+    except PyMongoError as e:
         print(f"Error al insertar autores: {e}")
         return []
 
 
 def insertar_libros(
-    db: pymongo.database.Database, libros: List[Tuple[str, int, str]]
-) -> List[str]:
+    db: pymongo.database.Database,
+    libros: List[Tuple[str, int, Union[str, ObjectId]]],
+) -> List[ObjectId]:
     """
     Inserta varios libros en la colección 'libros'
 
@@ -160,33 +284,97 @@ def insertar_libros(
     """
     # TODO: Implementar la inserción de libros
     try:
-        # Preparar documentos para inserción
-        documentos = []
-        for titulo, anio, autor_id_tuple in libros:
-            documento = {
-                "titulo": titulo,
-                "anio": anio,
-                "autor_id": str(
-                    autor_id_tuple
-                ),  # Convertir a string para compatibilidad
-            }
-            documentos.append(documento)
-
-        # Insertar documentos y obtener IDs
-        resultado = db.libros.insert_many(documentos)
-
-        # Convertir ObjectId a string para compatibilidad
-        ids_insertados = [str(doc_id) for doc_id in resultado.inserted_ids]
+        libros_carga = db.get_collection("libros", write_concern=ESCRITURA_CARGA)
+        filas = iter(libros)
+        # Se devuelven los ObjectId tal cual; solo se convierten al mostrarlos
+        ids_insertados: List[ObjectId] = []
+
+        try:
+            # Insertar por lotes de TAMANO_LOTE para no construir todos los
+            # documentos a la vez; autor_id se guarda como ObjectId para que
+            # coincida con autores._id
+            while lote := list(islice(filas, TAMANO_LOTE)):
+                documentos = [
+                    {
+                        "titulo": titulo,
+                        "anio": anio,
+                        "autor_id": _a_object_id(autor_id_tuple),
+                    }
+                    for titulo, anio, autor_id_tuple in lote
+                ]
+                resultado = libros_carga.insert_many(
+                    documentos, ordered=False, bypass_document_validation=True
+                )
+                ids_insertados.extend(resultado.inserted_ids)
+        finally:
+            # Los datos han cambiado (aunque sea en parte): invalidar las
+            # consultas memorizadas
+            limpiar_cache()
 
         print(f"Se insertaron {len(ids_insertados)} libros correctamente.")
 
         return ids_insertados
 
-    except Exception as e:
+    except BulkWriteError:
+        # Con ordered=False puede haber inserciones parciales: se propaga
+        # para que el llamador revise details["writeErrors"]
+        raise
+    except (InvalidId, PyMongoError) as e:
         print(f"Error al insertar libros: {e}")
         return []
 
 
+@lru_cache(maxsize=256)
+def _consulta_libros_cached(
+    db: pymongo.database.Database, nombre_autor: Optional[str] = None
+) -> Optional[Tuple[Tuple[Any, ...], ...]]:
+    """
+    Ejecuta las consultas de lectura de libros y memoriza su resultado.
+    La caché se vacía con limpiar_cache(), que llaman las funciones de este
+    módulo que modifican los datos.
+
+    Args:
+        db: Objeto de conexión a la base de datos MongoDB
+        nombre_autor: Nombre del autor, o None para todos los libros
+
+    Returns:
+        Sin autor, tuplas (titulo, anio, autor_nombre) de todos los libros.
+        Con autor, tuplas (titulo, anio) de sus libros, o None si no existe.
+    """
+    if nombre_autor is None:
+        return tuple(
+            (libro["titulo"], libro["anio"], libro["autor_nombre"])
+            for libro in db.libros.aggregate(
+                _PIPELINE_LIBROS_CON_AUTORES, batchSize=TAMANO_LOTE
+            )
+        )
+
+    # Buscar el autor y sus libros en una sola agregación; del autor solo se
+    # necesita el _id para el $lookup
+    pipeline = [
+        {"$match": {"nombre": nombre_autor}},
+        {"$project": {"_id": 1}},
+        _LOOKUP_LIBROS_DEL_AUTOR,
+        {"$project": {"libros": 1, "_id": 0}},
+    ]
+    autor = next(db.autores.aggregate(pipeline), None)
+
+    if not autor:
+        return None
+
+    return tuple((libro["titulo"], libro["anio"]) for libro in autor["libros"])
+
+
+def limpiar_cache() -> None:
+    """
+    Vacía la caché de consultas de libros. Debe llamarse tras modificar los
+    datos fuera de las funciones de este módulo (escrituras directas sobre
+    las colecciones, drop_collection u otros procesos), ya que la caché no
+    caduca por sí sola.
+    """
+    _consulta_libros_cached.cache_clear()
+
+
 def consultar_libros(db: pymongo.database.Database) -> None:
     """
     Consulta todos los libros y muestra título, año y nombre del autor
@@ -196,28 +384,13 @@ def consultar_libros(db: pymongo.database.Database) -> None:
     """
     # TODO: Implementar la consulta de libros con sus autores
     try:
-        # Agregación para obtener libros con información de autores
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "autores",
-                    "localField": "autor_id",
-                    "foreignField": "_id",
-                    "as": "autor",
-                }
-            },
-            {"$unwind": "$autor"},
-            {"$project": {"titulo": 1, "anio": 1, "autor_nombre": "$autor.nombre"}},
-            {"$sort": {"titulo": 1}},
-        ]
-
-        libros_con_autores = list(db.libros.aggregate(pipeline))
+        libros_con_autores = _consulta_libros_cached(db)
 
         print("\n=== LIBROS CON SUS AUTORES ===")
-        for libro in libros_con_autores:
-            print(f"- {libro['titulo']} ({libro['anio']}) - {libro['autor_nombre']}")
+        for titulo, anio, autor_nombre in libros_con_autores:
+            print(f"- {titulo} ({anio}) - {autor_nombre}")
 
-    except Exception as e:
+    except PyMongoError as e:
         print(f"Error al consultar libros: {e}")
 
 
@@ -236,33 +409,60 @@ def buscar_libros_por_autor(
     """
     # TODO: Implementar la búsqueda de libros por autor
     try:
-        # Buscar el autor por nombre
-        autor = db.autores.find_one({"nombre": nombre_autor})
+        libros = _consulta_libros_cached(db, nombre_autor)
 
-        if not autor:
+        if libros is None:
             print(f"No se encontró el autor: {nombre_autor}")
             return []
 
-        # Buscar libros del autor
-        libros = list(
-            db.libros.find(
-                {"autor_id": str(autor["_id"])}, {"_id": 0, "titulo": 1, "anio": 1}
-            )
-        )
-
         # Convertir a lista de tuplas (titulo, anio)
-        resultado = [(libro["titulo"], libro["anio"]) for libro in libros]
+        resultado = list(libros)
 
         return resultado
 
-    except Exception as e:
+    except PyMongoError as e:
         print(f"Error al buscar libros por autor: {e}")
         return []
 
 
+def buscar_libros_por_autores(
+    db: pymongo.database.Database, nombres_autores: List[str]
+) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Busca los libros de varios autores con una única consulta
+
+    Args:
+        db: Objeto de conexión a la base de datos MongoDB
+        nombres_autores: Nombres de los autores a buscar
+
+    Returns:
+        Diccionario {nombre_autor: lista de tuplas (titulo, anio)} con los
+        autores encontrados
+    """
+    try:
+        # Una sola agregación con $in en lugar de una consulta por autor
+        pipeline = [
+            {"$match": {"nombre": {"$in": nombres_autores}}},
+            {"$project": {"_id": 1, "nombre": 1}},
+            _LOOKUP_LIBROS_DEL_AUTOR,
+            {"$project": {"_id": 0, "nombre": 1, "libros": 1}},
+        ]
+
+        return {
+            autor["nombre"]: [
+                (libro["titulo"], libro["anio"]) for libro in autor["libros"]
+            ]
+            for autor in db.autores.aggregate(pipeline, batchSize=TAMANO_LOTE)
+        }
+
+    except PyMongoError as e:
+        print(f"Error al buscar libros por autores: {e}")
+        return {}
+
+
 def actualizar_libro(
     db: pymongo.database.Database,
-    id_libro: str,
+    id_libro: Union[str, ObjectId],
     nuevo_titulo: Optional[str] = None,
     nuevo_anio: Optional[int] = None,
 ) -> bool:
@@ -296,22 +496,25 @@ def actualizar_libro(
 
         # Actualizar el documento
         resultado = db.libros.update_one(
-            {"_id": pymongo.ObjectId(id_libro)}, {"$set": campos_actualizacion}
+            {"_id": _a_object_id(id_libro)}, {"$set": campos_actualizacion}
         )
 
         if resultado.modified_count > 0:
+            limpiar_cache()
             print(f"Libro con ID {id_libro} actualizado correctamente.")
             return True
         else:
             print(f"No se encontró ningún libro con ID {id_libro}.")
             return False
 
-    except Exception as e:
+    except (InvalidId, PyMongoError) as e:
         print(f"Error al actualizar libro: {e}")
         return False
 
 
-def eliminar_libro(db: pymongo.database.Database, id_libro: str) -> bool:
+def eliminar_libro(
+    db: pymongo.database.Database, id_libro: Union[str, ObjectId]
+) -> bool:
     """
     Elimina un libro por su ID
 
@@ -325,20 +528,103 @@ def eliminar_libro(db: pymongo.database.Database, id_libro: str) -> bool:
     # TODO: Implementar la eliminación de un libro
     try:
         # Eliminar el documento
-        resultado = db.libros.delete_one({"_id": pymongo.ObjectId(id_libro)})
+        resultado = db.libros.delete_one({"_id": _a_object_id(id_libro)})
 
         if resultado.deleted_count > 0:
+            limpiar_cache()
             print(f"Libro con ID {id_libro} eliminado correctamente.")
             return True
         else:
             print(f"No se encontró ningún libro con ID {id_libro}.")
             return False
 
-    except Exception as e:
+    except (InvalidId, PyMongoError) as e:
         print(f"Error al eliminar libro: {e}")
         return False
 
 
+def actualizar_libros(
+    db: pymongo.database.Database,
+    operaciones: List[Tuple[Union[str, ObjectId], Dict[str, Any]]],
+) -> int:
+    """
+    Actualiza varios libros enviando todas las modificaciones de una vez
+
+    Args:
+        db: Objeto de conexión a la base de datos MongoDB
+        operaciones: Lista de tuplas (id_libro, campos a actualizar)
+
+    Returns:
+        Número de libros modificados
+    """
+    if not operaciones:
+        return 0
+
+    try:
+        # Agrupar todas las actualizaciones en una sola llamada a bulk_write
+        peticiones = [
+            UpdateOne({"_id": _a_object_id(id_libro)}, {"$set": campos})
+            for id_libro, campos in operaciones
+        ]
+        try:
+            resultado = db.libros.bulk_write(peticiones, ordered=False)
+        finally:
+            # Con ordered=False las operaciones válidas se aplican aunque
+            # otras fallen: invalidar siempre las consultas memorizadas
+            limpiar_cache()
+        print(f"Se actualizaron {resultado.modified_count} libros correctamente.")
+
+        return resultado.modified_count
+
+    except BulkWriteError:
+        # Puede haber cambios parciales: se propaga para que el llamador
+        # revise details["writeErrors"]
+        raise
+    except (InvalidId, PyMongoError) as e:
+        print(f"Error al actualizar libros: {e}")
+        return 0
+
+
+def eliminar_libros(
+    db: pymongo.database.Database, ids_libros: List[Union[str, ObjectId]]
+) -> int:
+    """
+    Elimina varios libros enviando todas las eliminaciones de una vez
+
+    Args:
+        db: Objeto de conexión a la base de datos MongoDB
+        ids_libros: IDs de los libros a eliminar
+
+    Returns:
+        Número de libros eliminados
+    """
+    if not ids_libros:
+        return 0
+
+    try:
+        # Agrupar todas las eliminaciones en una sola llamada a bulk_write
+        peticiones = [
+            DeleteOne({"_id": _a_object_id(id_libro)}) for id_libro in ids_libros
+        ]
+        try:
+            resultado = db.libros.bulk_write(peticiones, ordered=False)
+        finally:
+            # Con ordered=False las operaciones válidas se aplican aunque
+            # otras fallen: invalidar siempre las consultas memorizadas
+            limpiar_cache()
+        print(f"Se eliminaron {resultado.deleted_count} libros correctamente.")
+
+        return resultado.deleted_count
+
+    except BulkWriteError:
+        # Puede haber cambios parciales: se propaga para que el llamador
+        # revise details["writeErrors"]
+        raise
+    except (InvalidId, PyMongoError) as e:
+        print(f"Error al eliminar libros: {e}")
+        return 0
+
+
 def ejemplo_transaccion(db: pymongo.database.Database) -> bool:
     """
     Demuestra el uso de transacciones para operaciones agrupadas
@@ -363,15 +649,17 @@ def ejemplo_transaccion(db: pymongo.database.Database) -> bool:
                 nuevo_libro = {
                     "titulo": "El laberinto de la soledad",
                     "anio": 1950,
-                    "autor_id": str(nuevo_autor_id),
+                    "autor_id": nuevo_autor_id,
                 }
                 resultado_libro = db.libros.insert_one(nuevo_libro, session=session)
 
-                # Confirmar transacción (automático con 'with')
-                print("Transacción completada: Se agregó 'Octavio Paz' y su libro.")
-                return True
+        # La transacción se confirma al salir del 'with': invalidar las
+        # consultas memorizadas
+        limpiar_cache()
+        print("Transacción completada: Se agregó 'Octavio Paz' y su libro.")
+        return True
 
-    except Exception as e:
+    except PyMongoError as e:
         print(f"Error en la transacción: {e}")
         return False
 
@@ -419,7 +707,5 @@ if __name__ == "__main__":
             mongodb_proceso.wait()
 
             # Eliminar directorio temporal
-            temp_dir = os.path.join(os.path.dirname(__file__), "temp_mongodb")
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            shutil.rmtree(TEMP_DIR, ignore_errors=True)
             print("MongoDB detenido correctamente.")
@@ -13,7 +13,9 @@ from unittest.mock import patch, MagicMock
 from ej3a4 import (verificar_mongodb_instalado, iniciar_mongodb_en_memoria,
                   crear_conexion, crear_colecciones, insertar_autores, insertar_libros,
                   consultar_libros, buscar_libros_por_autor, actualizar_libro,
-                  eliminar_libro, ejemplo_transaccion, DB_NAME, MONGODB_PORT)
+                  eliminar_libro, ejemplo_transaccion, DB_NAME, MONGODB_PORT,
+                  buscar_libros_por_autores, actualizar_libros, eliminar_libros,
+                  limpiar_cache)
 
 @pytest.fixture
 def mongodb_proceso():
@@ -49,6 +51,9 @@ def db(mongodb_proceso):
     db_conn.drop_collection("autores")
     db_conn.drop_collection("libros")
 
+    # Las colecciones se han borrado por fuera del módulo: vaciar la caché
+    limpiar_cache()
+
     yield db_conn
 
 @pytest.fixture
@@ -296,6 +301,101 @@ def test_eliminar_libro(db_con_datos):
     # Verificar que sólo se eliminó ese libro
     assert db_con_datos.libros.count_documents({}) == total_libros_inicial - 1
 
+def test_buscar_libros_por_autores(db_con_datos):
+    """Prueba la función buscar_libros_por_autores"""
+    resultado = buscar_libros_por_autores(
+        db_con_datos, ["Gabriel García Márquez", "Jorge Luis Borges", "Autor inexistente"]
+    )
+
+    # Solo aparecen los autores encontrados
+    assert set(resultado) == {"Gabriel García Márquez", "Jorge Luis Borges"}
+
+    assert sorted(resultado["Gabriel García Márquez"]) == [
+        ("Cien años de soledad", 1967),
+        ("El amor en los tiempos del cólera", 1985),
+    ]
+    assert sorted(resultado["Jorge Luis Borges"]) == [
+        ("El Aleph", 1949),
+        ("Ficciones", 1944),
+    ]
+
+def test_actualizar_libros(db_con_datos):
+    """Prueba la función actualizar_libros"""
+    # Llenar la caché de consultas antes de actualizar
+    assert ("Ficciones", 1944) in buscar_libros_por_autor(db_con_datos, "Jorge Luis Borges")
+
+    ficciones = db_con_datos.libros.find_one({"titulo": "Ficciones"})
+    aleph = db_con_datos.libros.find_one({"titulo": "El Aleph"})
+
+    # Un ID como string y otro como ObjectId
+    modificados = actualizar_libros(db_con_datos, [
+        (str(ficciones["_id"]), {"anio": 1956}),
+        (aleph["_id"], {"titulo": "El Aleph (Edición revisada)"}),
+    ])
+
+    # Verificar el número de libros modificados
+    assert modificados == 2
+
+    # Verificar que los documentos se actualizaron
+    assert db_con_datos.libros.find_one({"_id": ficciones["_id"]})["anio"] == 1956
+    assert db_con_datos.libros.find_one({"_id": aleph["_id"]})["titulo"] == "El Aleph (Edición revisada)"
+
+    # Verificar que la caché se invalidó y la búsqueda ve los cambios
+    libros = buscar_libros_por_autor(db_con_datos, "Jorge Luis Borges")
+    assert ("Ficciones", 1956) in libros
+    assert ("El Aleph (Edición revisada)", 1949) in libros
+
+    # Sin operaciones no se modifica nada
+    assert actualizar_libros(db_con_datos, []) == 0
+
+def test_actualizar_libros_con_fallo_parcial(db_con_datos):
+    """Prueba que actualizar_libros propaga el error y no deja la caché obsoleta"""
+    # Llenar la caché de consultas antes de actualizar
+    assert ("Ficciones", 1944) in buscar_libros_por_autor(db_con_datos, "Jorge Luis Borges")
+
+    ficciones = db_con_datos.libros.find_one({"titulo": "Ficciones"})
+    aleph = db_con_datos.libros.find_one({"titulo": "El Aleph"})
+
+    # Cambiar el _id no está permitido: esa operación falla y la otra se aplica
+    with pytest.raises(pymongo.errors.BulkWriteError) as error:
+        actualizar_libros(db_con_datos, [
+            (ficciones["_id"], {"anio": 1956}),
+            (aleph["_id"], {"_id": ObjectId()}),
+        ])
+
+    assert error.value.details["nModified"] == 1
+    assert len(error.value.details["writeErrors"]) == 1
+
+    # La búsqueda ve la actualización que sí se aplicó
+    assert ("Ficciones", 1956) in buscar_libros_por_autor(db_con_datos, "Jorge Luis Borges")
+
+def test_eliminar_libros(db_con_datos):
+    """Prueba la función eliminar_libros"""
+    # Llenar la caché de consultas antes de eliminar
+    assert len(buscar_libros_por_autor(db_con_datos, "Isabel Allende")) == 2
+
+    total_libros_inicial = db_con_datos.libros.count_documents({})
+    ids = [
+        db_con_datos.libros.find_one({"titulo": "La casa de los espíritus"})["_id"],
+        str(db_con_datos.libros.find_one({"titulo": "Eva Luna"})["_id"]),
+    ]
+
+    # Eliminar los libros
+    eliminados = eliminar_libros(db_con_datos, ids)
+
+    # Verificar el número de libros eliminados
+    assert eliminados == 2
+
+    # Verificar que sólo se eliminaron esos libros
+    assert db_con_datos.libros.count_documents({}) == total_libros_inicial - 2
+    assert db_con_datos.libros.count_documents({"titulo": {"$in": ["La casa de los espíritus", "Eva Luna"]}}) == 0
+
+    # Verificar que la caché se invalidó y la búsqueda ve los cambios
+    assert buscar_libros_por_autor(db_con_datos, "Isabel Allende") == []
+
+    # Volver a eliminar los mismos IDs no elimina nada
+    assert eliminar_libros(db_con_datos, ids) == 0
+
 def test_ejemplo_transaccion(db_con_datos):
     """Prueba la función ejemplo_transaccion"""
     # Obtener el estado inicial de la base de datos